@@ -2,7 +2,7 @@
 Configurações da aplicação search-tool.
 """
 
-from typing import List
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -21,10 +21,42 @@ class Settings(BaseSettings):
     typesense_protocol: str = "http"
     typesense_api_key: str = "xyz"
     typesense_timeout: int = 5
+    typesense_schema_timeout: int = 600  # alterações de schema e export (migrações)
     
     # Collection Settings
     products_collection: str = "produtos"
     
+    # Roteamento por storefront: chave do storefront -> nome da collection
+    # (ex: STOREFRONT_COLLECTIONS='{"loja_sp": "produtos_sp", "loja_rj": "produtos_rj"}')
+    storefront_collections: Dict[str, str] = {}
+    storefront_header: str = "X-Storefront"
+    
+    # Embeddings / busca híbrida (requer `pip install sentence-transformers`)
+    embeddings_enabled: bool = False
+    embedding_provider: str = "sentence-transformers"  # sentence-transformers | hashing (léxico)
+    embedding_model: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    embedding_dim: int = 384
+    embedding_batch_size: int = 64
+    embedding_cache_path: str = "data/.embedding_cache.sqlite3"
+    embedding_cache_size: int = 5000  # ~2 KB por consulta em disco (float32 x 384)
+    embedding_cache_save_interval: float = 60.0
+    hybrid_alpha: float = 0.3  # peso da similaridade vetorial na busca híbrida
+    
+    # Resiliência
+    read_timeout: float = 2.0  # timeout de cada tentativa de leitura (busca/autocomplete)
+    read_retries: int = 2  # apenas leituras idempotentes são repetidas
+    # Prazo total de uma leitura: comporta (read_retries + 1) tentativas de read_timeout e os backoffs
+    read_deadline: float = 6.5
+    retry_backoff_base: float = 0.05
+    retry_backoff_max: float = 1.0
+    error_log_limit: int = 5  # mensagens de erro por tipo a cada janela
+    error_log_interval: float = 10.0
+    error_log_sample_rate: float = 0.01  # fração das mensagens emitidas após o limite da janela
+    
+    # Schema Settings
+    # Limites superiores das faixas de preço usadas no campo derivado `faixa_preco`
+    price_buckets: List[float] = [500, 1000, 2500, 5000, 10000]
+    
     # API Settings
     api_host: str = "0.0.0.0"
     api_port: int = 8000
@@ -33,6 +65,19 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
         case_sensitive = False
+    
+    def collection_for(self, storefront: Optional[str] = None) -> str:
+        """Resolve a collection de um storefront (ou a padrão, se nenhum for informado)."""
+        if not storefront:
+            return self.products_collection
+        if storefront not in self.storefront_collections:
+            raise ValueError(f"Storefront desconhecido: {storefront}")
+        return self.storefront_collections[storefront]
+    
+    def all_collections(self) -> List[str]:
+        """Lista todas as collections de produtos configuradas, sem repetição."""
+        collections = [self.products_collection, *self.storefront_collections.values()]
+        return list(dict.fromkeys(collections))
 
 
 # Instância global das configurações
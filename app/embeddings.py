@@ -0,0 +1,311 @@
+"""
+Geração de embeddings para busca híbrida (textual + vetorial).
+
+Os embedders rodam localmente em CPU. O provider `sentence-transformers` usa
+um modelo semântico pré-treinado e precisa do pacote `sentence-transformers`
+instalado. O provider `hashing` não tem dependências, mas é apenas léxico
+(palavras e trigramas): tolera variações de grafia, não entende intenção.
+"""
+
+import abc
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from contextlib import closing
+from typing import Any, Dict, List, Optional, Sequence
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def product_text(document: Dict[str, Any]) -> str:
+    """Texto do produto usado para gerar o embedding (nome + descrição)."""
+    return f"{document.get('nome', '')}. {document.get('descricao', '')}".strip()
+
+
+class Embedder(abc.ABC):
+    """Interface base para geradores de embeddings."""
+
+    name: str = "base"
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    @abc.abstractmethod
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Gera embeddings normalizados para um lote de textos."""
+
+    def embed(self, text: str) -> List[float]:
+        """Gera o embedding de um único texto."""
+        return self.embed_batch([text])[0]
+
+
+class HashingEmbedder(Embedder):
+    """
+    Embedder léxico leve baseado em feature hashing de palavras e trigramas.
+
+    Não é semântico: não relaciona "fotos" a "câmera" como um modelo treinado.
+    É determinístico, barato em CPU e útil como fallback sem dependências.
+    """
+
+    name = "hashing"
+
+    def _features(self, text: str) -> List[str]:
+        normalized = unicodedata.normalize('NFKD', text.lower())
+        normalized = ''.join(c for c in normalized if not unicodedata.combining(c))
+        words = re.findall(r'\w+', normalized)
+        features = list(words)
+        for word in words:
+            padded = f"#{word}#"
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return features
+
+    def _embed_one(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for feature in self._features(text):
+            digest = hashlib.md5(feature.encode('utf-8')).digest()
+            index = int.from_bytes(digest[:4], 'little') % self.dim
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed_one(text) for text in texts]
+
+
+class SentenceTransformerEmbedder(Embedder):
+    """Embedder baseado em um modelo `sentence-transformers` rodando em CPU."""
+
+    name = "sentence-transformers"
+
+    def __init__(self, dim: int, model_name: str, batch_size: int):
+        super().__init__(dim)
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise RuntimeError(
+                "Provider 'sentence-transformers' requer o pacote: pip install sentence-transformers"
+            ) from e
+
+        self.model = SentenceTransformer(model_name, device='cpu')
+        self.batch_size = batch_size
+        model_dim = self.model.get_sentence_embedding_dimension()
+        if model_dim != dim:
+            raise RuntimeError(
+                f"Modelo '{model_name}' gera vetores de {model_dim} dimensões, mas EMBEDDING_DIM={dim}"
+            )
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        )
+        return vectors.tolist()
+
+
+class EmbeddingCache:
+    """
+    Cache LRU de embeddings de consultas, persistido em SQLite como float32.
+
+    `get`/`put` só tocam a memória. `save` grava apenas as entradas novas ou
+    usadas desde a última gravação e deve rodar fora do caminho da requisição
+    (tarefa periódica em thread e shutdown). O banco guarda o identificador do
+    modelo; se o modelo mudar, o cache salvo é descartado.
+    """
+
+    def __init__(self, path: Optional[str], max_size: int, model_id: str):
+        self.path = path
+        self.max_size = max_size
+        self.model_id = model_id
+        self._entries: "OrderedDict[str, array]" = OrderedDict()
+        self._dirty: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries "
+            "(query TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        return conn
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'model'").fetchone()
+                if row is None or row[0] != self.model_id:
+                    logger.info("Cache de embeddings descartado: modelo diferente")
+                    conn.execute("DELETE FROM entries")
+                    return
+                rows = conn.execute(
+                    "SELECT query, vector FROM entries ORDER BY last_used DESC LIMIT ?",
+                    (self.max_size,)
+                ).fetchall()
+            for query, blob in reversed(rows):
+                vector = array('f')
+                vector.frombytes(blob)
+                self._entries[query] = vector
+            logger.info(f"Cache de embeddings carregado: {len(self._entries)} consultas")
+        except sqlite3.Error as e:
+            logger.warning(f"Não foi possível carregar o cache de embeddings: {e}")
+
+    def save(self) -> None:
+        """Persiste as entradas novas/usadas e descarta as excedentes (bloqueante)."""
+        if not self.path:
+            return
+        with self._lock:
+            pending = [
+                (query, self._entries[query].tobytes(), last_used)
+                for query, last_used in self._dirty.items()
+                if query in self._entries
+            ]
+            self._dirty = {}
+        if not pending:
+            return
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('model', ?)", (self.model_id,)
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO entries (query, vector, last_used) VALUES (?, ?, ?)",
+                    pending
+                )
+                conn.execute(
+                    "DELETE FROM entries WHERE query NOT IN "
+                    "(SELECT query FROM entries ORDER BY last_used DESC LIMIT ?)",
+                    (self.max_size,)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Não foi possível salvar o cache de embeddings: {e}")
+
+    def get(self, key: str) -> Optional[Sequence[float]]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self._dirty[key] = time.time()
+            return vector
+
+    def put(self, key: str, vector: Sequence[float]) -> None:
+        with self._lock:
+            self._entries[key] = array('f', vector)
+            self._entries.move_to_end(key)
+            self._dirty[key] = time.time()
+            while len(self._entries) > self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self._dirty.pop(evicted, None)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._dirty.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class EmbeddingService:
+    """Combina um embedder com o cache de consultas."""
+
+    def __init__(self, embedder: Embedder, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.cache = cache
+
+    @staticmethod
+    def _query_key(query: str) -> str:
+        return ' '.join(query.lower().split())
+
+    def embed_query(self, query: str) -> Sequence[float]:
+        """Embedding de uma consulta, usando o cache LRU."""
+        key = self._query_key(query)
+        vector = self.cache.get(key)
+        if vector is None:
+            vector = self.embedder.embed(key)
+            self.cache.put(key, vector)
+        return vector
+
+    def forget_query(self, query: str) -> None:
+        """Remove uma consulta do cache."""
+        self.cache.discard(self._query_key(query))
+
+    def embed_documents(self, documents: List[Dict[str, Any]]) -> List[List[float]]:
+        """Embeddings de um lote de produtos (nome + descrição), em lotes."""
+        texts = [product_text(doc) for doc in documents]
+        batch_size = settings.embedding_batch_size
+        vectors = []
+        for i in range(0, len(texts), batch_size):
+            vectors.extend(self.embedder.embed_batch(texts[i:i + batch_size]))
+        return vectors
+
+
+def create_embedder() -> Embedder:
+    """Cria o embedder configurado em `embedding_provider`."""
+    if settings.embedding_provider == "hashing":
+        return HashingEmbedder(settings.embedding_dim)
+    if settings.embedding_provider == "sentence-transformers":
+        return SentenceTransformerEmbedder(
+            settings.embedding_dim,
+            settings.embedding_model,
+            settings.embedding_batch_size
+        )
+    raise ValueError(f"Provider de embeddings desconhecido: {settings.embedding_provider}")
+
+
+def embedding_model_id() -> str:
+    """Identificador do espaço de embeddings configurado (sem carregar o modelo)."""
+    if settings.embedding_provider == "hashing":
+        return f"hashing:{settings.embedding_dim}"
+    return f"{settings.embedding_provider}:{settings.embedding_model}:{settings.embedding_dim}"
+
+
+_embedding_service: Optional[EmbeddingService] = None
+_embedding_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """
+    Retorna o serviço de embeddings (criado na primeira chamada).
+
+    A criação pode carregar um modelo; chame via `asyncio.to_thread` em código async.
+    """
+    global _embedding_service
+    with _embedding_service_lock:
+        if _embedding_service is None:
+            cache = EmbeddingCache(
+                settings.embedding_cache_path or None,
+                settings.embedding_cache_size,
+                embedding_model_id()
+            )
+            _embedding_service = EmbeddingService(create_embedder(), cache)
+    return _embedding_service
+
+
+def current_embedding_service() -> Optional[EmbeddingService]:
+    """Retorna o serviço de embeddings apenas se ele já foi criado."""
+    return _embedding_service
+
+
+async def autosave_embedding_cache(interval: float) -> None:
+    """Persiste o cache de consultas periodicamente, em thread, fora das requisições."""
+    while True:
+        await asyncio.sleep(interval)
+        service = current_embedding_service()
+        if service is not None:
+            await asyncio.to_thread(service.cache.save)
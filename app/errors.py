@@ -0,0 +1,233 @@
+"""
+Erros tipados da API, tradução de erros do Typesense e utilitários do
+caminho de erro (log com limite de taxa e retry com backoff).
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+import requests
+from typesense import exceptions as ts_exceptions
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SearchServiceError(Exception):
+    """Erro base da API, com status HTTP e código estável para os clientes."""
+
+    status_code: int = 502
+    code: str = "upstream_error"
+    retryable: bool = False
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"status": "error", "code": self.code, "message": self.message}
+
+
+class UpstreamTimeoutError(SearchServiceError):
+    """O Typesense não respondeu dentro do timeout."""
+
+    status_code = 504
+    code = "upstream_timeout"
+    retryable = True
+
+
+class UpstreamUnavailableError(SearchServiceError):
+    """O Typesense está inacessível ou sobrecarregado."""
+
+    status_code = 503
+    code = "upstream_unavailable"
+    retryable = True
+
+
+class BadFilterError(SearchServiceError):
+    """Parâmetros de busca/filtro ou documento rejeitados pelo Typesense."""
+
+    status_code = 400
+    code = "bad_request"
+
+
+class NotFoundError(SearchServiceError):
+    """Documento ou collection inexistente."""
+
+    status_code = 404
+    code = "not_found"
+
+
+class ConflictError(SearchServiceError):
+    """Documento ou collection já existente."""
+
+    status_code = 409
+    code = "conflict"
+
+
+def error_for_status(status: Optional[int], message: str) -> SearchServiceError:
+    """Converte um status HTTP retornado pelo Typesense no erro tipado correspondente."""
+    if status == 408:
+        return UpstreamTimeoutError("Typesense não respondeu a tempo")
+    if status == 429 or (status is not None and status >= 500):
+        return UpstreamUnavailableError("Typesense indisponível")
+    if status in (400, 422):
+        return BadFilterError(message)
+    if status == 404:
+        return NotFoundError(message)
+    if status == 409:
+        return ConflictError(message)
+    return SearchServiceError("Erro inesperado ao acessar o Typesense")
+
+
+# Status HTTP equivalente às exceções de erro do cliente do Typesense
+_EXCEPTION_STATUS = (
+    (ts_exceptions.RequestMalformed, 400),
+    (ts_exceptions.ObjectUnprocessable, 422),
+    (ts_exceptions.ObjectNotFound, 404),
+    (ts_exceptions.ObjectAlreadyExists, 409),
+)
+
+# Exceções que indicam falha na comunicação com o Typesense
+UPSTREAM_ERRORS = (ts_exceptions.TypesenseClientError, requests.exceptions.RequestException)
+
+
+def translate_error(exc: Exception) -> SearchServiceError:
+    """Converte uma exceção do Typesense/requests no erro tipado correspondente."""
+    if isinstance(exc, SearchServiceError):
+        return exc
+    if isinstance(exc, (requests.exceptions.Timeout, ts_exceptions.Timeout)):
+        return error_for_status(408, str(exc))
+    if isinstance(exc, (
+        requests.exceptions.ConnectionError,
+        ts_exceptions.ServiceUnavailable,
+        ts_exceptions.ServerError,
+        ts_exceptions.HTTPStatus0Error,
+    )):
+        return error_for_status(503, str(exc))
+    if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+        return error_for_status(exc.response.status_code, exc.response.text)
+    for exc_type, status in _EXCEPTION_STATUS:
+        if isinstance(exc, exc_type):
+            return error_for_status(status, str(exc))
+    return error_for_status(None, str(exc))
+
+
+class RateLimitedLogger:
+    """
+    Logger que limita e amostra as mensagens de cada tipo por janela.
+
+    Durante uma indisponibilidade, as primeiras `limit` mensagens de cada chave
+    saem por janela de `interval` segundos; das seguintes, apenas uma fração
+    `sample_rate` é emitida. As descartadas são contadas e resumidas em uma
+    única linha quando a janela seguinte começa.
+    """
+
+    def __init__(self, target: logging.Logger, limit: int, interval: float, sample_rate: float = 0.0):
+        self.target = target
+        self.limit = limit
+        self.interval = interval
+        self.sample_rate = sample_rate
+        self._windows: Dict[str, Tuple[float, int, int]] = {}
+        self._lock = threading.Lock()
+
+    def log(self, level: int, key: str, message: str, *args: Any) -> None:
+        if not self.target.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        previous_suppressed = 0
+        with self._lock:
+            start, count, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - start >= self.interval:
+                previous_suppressed = suppressed
+                start, count, suppressed = now, 0, 0
+            count += 1
+            emit = count <= self.limit or random.random() < self.sample_rate
+            if not emit:
+                suppressed += 1
+            self._windows[key] = (start, count, suppressed)
+        if previous_suppressed:
+            self.target.log(level, "%s: %d mensagens suprimidas na última janela", key, previous_suppressed)
+        if emit:
+            self.target.log(level, message, *args)
+
+    def error(self, key: str, message: str, *args: Any) -> None:
+        self.log(logging.ERROR, key, message, *args)
+
+    def warning(self, key: str, message: str, *args: Any) -> None:
+        self.log(logging.WARNING, key, message, *args)
+
+
+error_log = RateLimitedLogger(
+    logger, settings.error_log_limit, settings.error_log_interval, settings.error_log_sample_rate
+)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Atraso com backoff exponencial e jitter completo para a tentativa informada."""
+    ceiling = min(settings.retry_backoff_max, settings.retry_backoff_base * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+async def call_typesense(
+    operation: str,
+    fn: Callable[[], T],
+    idempotent: bool = False,
+    retries: Optional[int] = None,
+    deadline: Optional[float] = None,
+    attempt_timeout: Optional[float] = None,
+    expected: Tuple[Type[SearchServiceError], ...] = ()
+) -> T:
+    """
+    Executa uma chamada ao Typesense traduzindo erros para `SearchServiceError`.
+
+    A chamada (bloqueante, via `requests`) roda em uma thread para não travar o
+    event loop. Somente chamadas idempotentes (leituras) são repetidas, e apenas
+    para erros transitórios (timeout/indisponibilidade), com backoff exponencial
+    e jitter, dentro de um prazo total (`deadline`, por padrão `read_deadline`
+    para leituras). Uma nova tentativa só começa se o prazo restante comporta o
+    timeout do cliente (`attempt_timeout`, por padrão `read_timeout`); assim
+    nenhuma requisição é abandonada em uma thread pelo `wait_for`.
+    Erros em `expected` são tratados pelo chamador e não são logados.
+    """
+    max_retries = (settings.read_retries if retries is None else retries) if idempotent else 0
+    if deadline is None and idempotent:
+        deadline = settings.read_deadline
+    if attempt_timeout is None:
+        attempt_timeout = settings.read_timeout if idempotent else 0.0
+    loop = asyncio.get_running_loop()
+    expires_at = loop.time() + deadline if deadline else None
+    attempt = 0
+    while True:
+        try:
+            if expires_at is None:
+                return await asyncio.to_thread(fn)
+            return await asyncio.wait_for(asyncio.to_thread(fn), expires_at - loop.time())
+        except asyncio.TimeoutError:
+            error, cause = UpstreamTimeoutError("Prazo da requisição ao Typesense esgotado"), "deadline"
+        except UPSTREAM_ERRORS as e:
+            error, cause = translate_error(e), type(e).__name__
+
+        if error.retryable and attempt < max_retries and cause != "deadline":
+            delay = backoff_delay(attempt)
+            if expires_at is None or loop.time() + delay + attempt_timeout <= expires_at:
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+        if not isinstance(error, expected):
+            # Erros do cliente (4xx, ex: filtro inválido) não indicam falha do serviço
+            level = logging.ERROR if error.status_code >= 500 else logging.WARNING
+            error_log.log(
+                level,
+                f"{operation}:{error.code}",
+                "Erro em %s: %s (%s)", operation, error.code, cause
+            )
+        raise error from None
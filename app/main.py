@@ -4,16 +4,19 @@ Aplicação principal search-tool.
 API de busca inteligente usando FastAPI + Typesense.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from .config import Settings, get_settings
+from .embeddings import autosave_embedding_cache, current_embedding_service
+from .errors import SearchServiceError, error_log
 from .models import HealthResponse
-from .routes.search import router as search_router
+from .routes.search import router as search_router, storefront_router
 from .typesense_client import TypesenseClient, get_typesense_client
 
 # Configurar logging
@@ -30,21 +33,34 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Iniciando search-tool API...")
     
-    # Tentar criar collection de produtos
+    # Tentar criar collections de produtos (padrão e storefronts)
     client = get_typesense_client()
-    collection_created = await client.create_products_collection()
+    collection_created = await client.bootstrap_collections()
     
     if collection_created:
-        logger.info("✅ Collection de produtos configurada")
+        logger.info("✅ Collections de produtos configuradas")
     else:
         logger.warning("⚠️ Erro ao configurar collection - Typesense pode não estar disponível")
     
+    # Persistência periódica do cache de embeddings, fora das requisições
+    settings = get_settings()
+    autosave_task = None
+    if settings.embeddings_enabled:
+        autosave_task = asyncio.create_task(
+            autosave_embedding_cache(settings.embedding_cache_save_interval)
+        )
+    
     logger.info("✅ search-tool API iniciada com sucesso!")
     
     yield
     
     # Shutdown
     logger.info("🛑 Finalizando search-tool API...")
+    if autosave_task is not None:
+        autosave_task.cancel()
+    embedding_service = current_embedding_service()
+    if embedding_service is not None:
+        await asyncio.to_thread(embedding_service.cache.save)
 
 
 def create_application() -> FastAPI:
@@ -72,6 +88,7 @@ def create_application() -> FastAPI:
     
     # Incluir routers
     app.include_router(search_router)
+    app.include_router(storefront_router)
     
     return app
 
@@ -82,41 +99,35 @@ app = create_application()
 
 @app.get("/health", response_model=HealthResponse, tags=["health"])
 async def health_check(
+    response: Response,
     client: TypesenseClient = Depends(get_typesense_client)
 ):
     """
     Endpoint de health check.
     
-    Verifica status da API e conectividade com Typesense.
+    Verifica status da API e conectividade com Typesense. Responde 503
+    quando o Typesense está indisponível, para que load balancers tirem
+    a instância de rotação.
     """
-    try:
-        # Verificar conexão com Typesense
-        typesense_health = await client.health_check()
-        
-        if typesense_health["status"] == "ok":
-            return HealthResponse(
-                status="healthy",
-                api_status="running",
-                typesense_status="connected",
-                typesense_info=typesense_health.get("typesense"),
-                message="API e Typesense funcionando normalmente"
-            )
-        else:
-            return HealthResponse(
-                status="degraded",
-                api_status="running",
-                typesense_status="disconnected",
-                message=f"API funcionando, mas Typesense indisponível: {typesense_health.get('message')}"
-            )
-            
-    except Exception as e:
-        logger.error(f"Erro no health check: {e}")
+    # Verificar conexão com Typesense
+    typesense_health = await client.health_check()
+    
+    if typesense_health["status"] == "ok":
         return HealthResponse(
-            status="unhealthy",
+            status="healthy",
             api_status="running",
-            typesense_status="error",
-            message=f"Erro interno: {str(e)}"
+            typesense_status="connected",
+            typesense_info=typesense_health.get("typesense"),
+            message="API e Typesense funcionando normalmente"
         )
+    
+    response.status_code = 503
+    return HealthResponse(
+        status="degraded",
+        api_status="running",
+        typesense_status="disconnected",
+        message=f"API funcionando, mas Typesense indisponível ({typesense_health.get('code')})"
+    )
 
 
 @app.get("/", tags=["info"])
@@ -133,15 +144,23 @@ async def root():
             "search": "/api/v1/search",
             "autocomplete": "/api/v1/autocomplete",
             "index": "/api/v1/index",
-            "delete": "/api/v1/documents/{id}"
+            "delete": "/api/v1/documents/{id}",
+            "storefront": "/api/v1/storefronts/{storefront}/..."
         }
     }
 
 
+@app.exception_handler(SearchServiceError)
+async def search_service_error_handler(request: Request, exc: SearchServiceError):
+    """Converte erros tipados do Typesense na resposta HTTP correspondente."""
+    headers = {"Retry-After": "1"} if exc.retryable else None
+    return JSONResponse(status_code=exc.status_code, content=exc.to_dict(), headers=headers)
+
+
 @app.exception_handler(500)
 async def internal_server_error_handler(request, exc):
     """Handler para erros internos do servidor."""
-    logger.error(f"Erro interno: {exc}")
+    error_log.error(f"internal:{type(exc).__name__}", "Erro interno: %s", exc)
     return JSONResponse(
         status_code=500,
         content={
@@ -78,6 +78,13 @@ class DeleteResponse(BaseModel):
     message: Optional[str] = Field(None, description="Mensagem de erro ou sucesso")
 
 
+class ErrorResponse(BaseModel):
+    """Modelo para respostas de erro (4xx/5xx)."""
+    status: str = Field("error", description="Sempre 'error'")
+    code: str = Field(..., description="Código do erro (upstream_timeout, upstream_unavailable, bad_request, not_found, conflict)")
+    message: str = Field(..., description="Descrição do erro")
+
+
 class HealthResponse(BaseModel):
     """Modelo para resposta de health check."""
     status: str = Field(..., description="Status da API")
@@ -5,93 +5,153 @@ Rotas para operações de busca.
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
 
+from ..config import Settings, get_settings
 from ..models import (
     SearchResponse, AutocompleteResponse, IndexResponse, 
-    DeleteResponse, ProductCreate
+    DeleteResponse, ErrorResponse, ProductCreate
 )
-from ..typesense_client import TypesenseClient, get_typesense_client
+from ..typesense_client import TypesenseClient, get_typesense_client, price_bucket_labels
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1", tags=["search"])
+# Erros do Typesense são convertidos em SearchServiceError e tratados em main.py
+ERROR_RESPONSES = {
+    status_code: {"model": ErrorResponse}
+    for status_code in (400, 404, 409, 502, 503, 504)
+}
+
+
+
+def get_storefront(
+    storefront: str = Path(..., description="Storefront (chave em STOREFRONT_COLLECTIONS)"),
+    settings: Settings = Depends(get_settings)
+) -> str:
+    """Declara e valida o storefront do path nas rotas de `storefront_router`."""
+    if storefront not in settings.storefront_collections:
+        raise HTTPException(status_code=404, detail=f"Storefront desconhecido: {storefront}")
+    return storefront
+
+
+router = APIRouter(prefix="/api/v1", tags=["search"], responses=ERROR_RESPONSES)
+
+# Mesmas rotas com o storefront no path (ex: /api/v1/storefronts/loja_sp/search)
+storefront_router = APIRouter(
+    prefix="/api/v1/storefronts/{storefront}",
+    tags=["storefront"],
+    responses=ERROR_RESPONSES,
+    dependencies=[Depends(get_storefront)]
+)
+
+
+def get_collection_name(
+    request: Request,
+    settings: Settings = Depends(get_settings)
+) -> str:
+    """
+    Resolve a collection da requisição.
+    
+    O storefront vem do path (/storefronts/{storefront}) ou do header
+    configurado em `storefront_header`; sem storefront, usa a collection padrão.
+    """
+    storefront = request.path_params.get("storefront") or request.headers.get(settings.storefront_header)
+    try:
+        return settings.collection_for(storefront)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
 
 @router.get("/search", response_model=SearchResponse)
+@storefront_router.get("/search", response_model=SearchResponse)
 async def search_products(
     q: str = Query(..., description="Termo de busca"),
     categoria: Optional[str] = Query(None, description="Filtrar por categoria"),
     marca: Optional[str] = Query(None, description="Filtrar por marca"),
     preco_min: Optional[float] = Query(None, description="Preço mínimo", ge=0),
     preco_max: Optional[float] = Query(None, description="Preço máximo", ge=0),
+    faixa_preco: Optional[str] = Query(None, description="Filtrar por faixa de preço (ex: 1000-2500, 10000+)"),
+    in_stock_only: bool = Query(False, description="Retornar apenas produtos em estoque"),
+    mode: str = Query("keyword", description="Modo de busca (keyword|hybrid)", pattern="^(keyword|hybrid)$"),
     sort: Optional[str] = Query(None, description="Campo para ordenação (preco|avaliacao|relevancia)"),
     limit: int = Query(10, description="Número máximo de resultados", ge=1, le=100),
     offset: int = Query(0, description="Offset para paginação", ge=0),
+    collection: str = Depends(get_collection_name),
+    settings: Settings = Depends(get_settings),
     client: TypesenseClient = Depends(get_typesense_client)
 ):
     """
     Busca produtos no catálogo eletrônico.
     
-    Suporta busca textual, filtros por categoria/marca/preço e ordenação.
+    Suporta busca textual ou híbrida (textual + semântica), filtros por
+    categoria/marca/preço/estoque e ordenação.
     """
-    try:
-        # Validar range de preços
-        if preco_min is not None and preco_max is not None and preco_max < preco_min:
-            raise HTTPException(
-                status_code=400, 
-                detail="Preço máximo deve ser maior que o mínimo"
-            )
-        
-        # Construir filtros
-        filters = []
-        if categoria:
-            filters.append(f"categoria:{categoria}")
-        if marca:
-            filters.append(f"marca:{marca}")
-        if preco_min is not None:
-            filters.append(f"preco:>={preco_min}")
-        if preco_max is not None:
-            filters.append(f"preco:<={preco_max}")
-        
-        filter_str = " && ".join(filters) if filters else None
-        
-        # Mapear ordenação
-        sort_mapping = {
-            "preco": "preco:asc",
-            "avaliacao": "avaliacao:desc",
-            "relevancia": "_text_match:desc,avaliacao:desc"
-        }
-        sort_by = sort_mapping.get(sort) if sort else None
-        
-        # Executar busca
-        result = await client.search_products(
-            query=q,
-            filters=filter_str,
-            sort_by=sort_by,
-            limit=limit,
-            offset=offset
+    # Validar range de preços
+    if preco_min is not None and preco_max is not None and preco_max < preco_min:
+        raise HTTPException(
+            status_code=400, 
+            detail="Preço máximo deve ser maior que o mínimo"
+        )
+    
+    # Validar modo de busca
+    if mode == "hybrid" and not settings.embeddings_enabled:
+        raise HTTPException(
+            status_code=400,
+            detail="Busca híbrida indisponível: embeddings desabilitados"
         )
-        
-        return SearchResponse(**result)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Erro na busca: {e}")
-        return SearchResponse(
-            status="error",
-            query=q,
-            total=0,
-            results=[],
-            message=f"Erro interno: {str(e)}"
+    
+    # Validar faixa de preço
+    if faixa_preco is not None and faixa_preco not in price_bucket_labels():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Faixa de preço inválida. Use uma de: {', '.join(price_bucket_labels())}"
         )
+    
+    # Construir filtros
+    filters = []
+    if categoria:
+        filters.append(f"categoria:{categoria}")
+    if marca:
+        filters.append(f"marca:{marca}")
+    if preco_min is not None:
+        filters.append(f"preco:>={preco_min}")
+    if preco_max is not None:
+        filters.append(f"preco:<={preco_max}")
+    if faixa_preco:
+        filters.append(f"faixa_preco:=`{faixa_preco}`")
+    if in_stock_only:
+        filters.append("em_estoque:true")
+    
+    filter_str = " && ".join(filters) if filters else None
+    
+    # Mapear ordenação
+    sort_mapping = {
+        "preco": "preco:asc",
+        "avaliacao": "avaliacao:desc",
+        "relevancia": "_text_match:desc,avaliacao:desc"
+    }
+    sort_by = sort_mapping.get(sort) if sort else None
+    
+    # Executar busca
+    result = await client.search_products(
+        query=q,
+        filters=filter_str,
+        sort_by=sort_by,
+        limit=limit,
+        offset=offset,
+        collection=collection,
+        hybrid=mode == "hybrid"
+    )
+    
+    return SearchResponse(**result)
 
 
 @router.get("/autocomplete", response_model=AutocompleteResponse)
+@storefront_router.get("/autocomplete", response_model=AutocompleteResponse)
 async def autocomplete_products(
     q: str = Query(..., description="Prefixo para autocompletar", min_length=1),
     limit: int = Query(5, description="Número máximo de sugestões", ge=1, le=20),
+    collection: str = Depends(get_collection_name),
     client: TypesenseClient = Depends(get_typesense_client)
 ):
     """
@@ -99,23 +159,15 @@ async def autocomplete_products(
     
     Busca por prefixos em nomes de produtos e marcas.
     """
-    try:
-        result = await client.autocomplete(prefix=q, limit=limit)
-        return AutocompleteResponse(**result)
-        
-    except Exception as e:
-        logger.error(f"Erro no autocompletar: {e}")
-        return AutocompleteResponse(
-            status="error",
-            prefix=q,
-            suggestions=[],
-            message=f"Erro interno: {str(e)}"
-        )
+    result = await client.autocomplete(prefix=q, limit=limit, collection=collection)
+    return AutocompleteResponse(**result)
 
 
 @router.post("/index", response_model=IndexResponse)
+@storefront_router.post("/index", response_model=IndexResponse)
 async def index_product(
     product: ProductCreate,
+    collection: str = Depends(get_collection_name),
     client: TypesenseClient = Depends(get_typesense_client)
 ):
     """
@@ -123,29 +175,23 @@ async def index_product(
     
     Adiciona o produto na base Typesense para ser encontrado nas buscas.
     """
-    try:
-        # Converter para dict
-        product_dict = product.model_dump()
-        
-        # Garantir que tem ID
-        if not product_dict.get('id'):
-            product_dict['id'] = product.id
-        
-        result = await client.index_document(product_dict)
-        
-        return IndexResponse(**result)
-        
-    except Exception as e:
-        logger.error(f"Erro ao indexar produto: {e}")
-        return IndexResponse(
-            status="error",
-            message=f"Erro interno: {str(e)}"
-        )
+    # Converter para dict
+    product_dict = product.model_dump()
+    
+    # Garantir que tem ID
+    if not product_dict.get('id'):
+        product_dict['id'] = product.id
+    
+    result = await client.index_document(product_dict, collection=collection)
+    
+    return IndexResponse(**result)
 
 
 @router.delete("/documents/{document_id}", response_model=DeleteResponse)
+@storefront_router.delete("/documents/{document_id}", response_model=DeleteResponse)
 async def delete_product(
     document_id: str,
+    collection: str = Depends(get_collection_name),
     client: TypesenseClient = Depends(get_typesense_client)
 ):
     """
@@ -153,13 +199,5 @@ async def delete_product(
     
     Remove o produto da base Typesense.
     """
-    try:
-        result = await client.delete_document(document_id)
-        return DeleteResponse(**result)
-        
-    except Exception as e:
-        logger.error(f"Erro ao remover produto: {e}")
-        return DeleteResponse(
-            status="error",
-            message=f"Erro interno: {str(e)}"
-        ) 
\ No newline at end of file
+    result = await client.delete_document(document_id, collection=collection)
+    return DeleteResponse(**result) 
\ No newline at end of file
@@ -2,17 +2,90 @@
 Cliente Typesense para operações de busca e indexação.
 """
 
+import asyncio
+import itertools
+import json
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Set
+from urllib.parse import quote
 
+import requests
 import typesense
-from typesense.exceptions import TypesenseClientError
 
 from .config import settings
+from .embeddings import embedding_model_id, get_embedding_service
+from .errors import (
+    ConflictError, NotFoundError, SearchServiceError, call_typesense, error_for_status
+)
 
 logger = logging.getLogger(__name__)
 
 
+def price_bucket_labels() -> List[str]:
+    """Retorna os rótulos das faixas de preço configuradas, em ordem."""
+    labels = []
+    lower = 0
+    for upper in settings.price_buckets:
+        labels.append(f"{lower:g}-{upper:g}")
+        lower = upper
+    labels.append(f"{lower:g}+")
+    return labels
+
+
+def price_bucket(preco: float) -> str:
+    """Retorna o rótulo da faixa de preço correspondente ao valor."""
+    labels = price_bucket_labels()
+    for upper, label in zip(settings.price_buckets, labels):
+        if preco < upper:
+            return label
+    return labels[-1]
+
+
+def with_derived_fields(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Retorna uma cópia do documento com os campos derivados preenchidos."""
+    document = dict(document)
+    if 'estoque' in document:
+        document['em_estoque'] = document['estoque'] > 0
+    if 'preco' in document:
+        document['faixa_preco'] = price_bucket(document['preco'])
+    return document
+
+
+# O Typesense rejeita query strings acima de 4000 caracteres; folga para os demais parâmetros
+MAX_FILTER_LENGTH = 3500
+# per_page máximo do Typesense, usado para conferir quais IDs restaram após uma remoção
+MAX_IDS_PER_FILTER = 250
+
+
+def id_filter(document_ids: Iterable[str]) -> str:
+    """Monta o `filter_by` que seleciona documentos por ID."""
+    ids = ",".join(f"`{document_id}`" for document_id in document_ids)
+    return f"id:[{ids}]"
+
+
+def id_filter_batches(document_ids: List[str], max_ids: int = MAX_IDS_PER_FILTER) -> List[List[str]]:
+    """
+    Divide IDs em lotes cujo `filter_by`, codificado na URL, cabe em `MAX_FILTER_LENGTH`.
+    
+    Cada lote tem no máximo `max_ids` IDs (limitado a `MAX_IDS_PER_FILTER`).
+    """
+    max_ids = min(max_ids, MAX_IDS_PER_FILTER)
+    base_length = len(quote(id_filter([]), safe=''))
+    batches: List[List[str]] = []
+    current: List[str] = []
+    length = base_length
+    for document_id in document_ids:
+        item_length = len(quote(f"`{document_id}`,", safe=''))
+        if current and (length + item_length > MAX_FILTER_LENGTH or len(current) >= max_ids):
+            batches.append(current)
+            current, length = [], base_length
+        current.append(document_id)
+        length += item_length
+    if current:
+        batches.append(current)
+    return batches
+
+
 class TypesenseClient:
     """Cliente centralizado para operações com Typesense."""
     
@@ -25,61 +98,400 @@ class TypesenseClient:
                 'protocol': settings.typesense_protocol
             }],
             'api_key': settings.typesense_api_key,
-            'connection_timeout_seconds': settings.typesense_timeout
+            'connection_timeout_seconds': settings.typesense_timeout,
+            # Retries ficam a cargo de call_typesense (só leituras, com jitter)
+            'num_retries': 0
+        })
+        # Leituras (busca/autocomplete) usam timeout curto por tentativa,
+        # para caberem as tentativas de call_typesense dentro de read_deadline
+        self.read_client = typesense.Client({
+            'nodes': [{
+                'host': settings.typesense_host,
+                'port': settings.typesense_port,
+                'protocol': settings.typesense_protocol
+            }],
+            'api_key': settings.typesense_api_key,
+            'connection_timeout_seconds': settings.read_timeout,
+            'num_retries': 0
         })
+        # Handles por collection e collections cujo schema já foi preparado
+        self._collections: Dict[str, Any] = {}
+        self._read_collections: Dict[str, Any] = {}
+        self._ready_collections: Set[str] = set()
+        self._schema_client: Optional[typesense.Client] = None
+    
+    @property
+    def schema_client(self) -> typesense.Client:
+        """
+        Cliente com timeout longo para alterações de schema e export.
+        
+        Um alter de schema reindexa o campo de forma síncrona no Typesense e
+        pode levar minutos em catálogos grandes.
+        """
+        if self._schema_client is None:
+            self._schema_client = typesense.Client({
+                'nodes': [{
+                    'host': settings.typesense_host,
+                    'port': settings.typesense_port,
+                    'protocol': settings.typesense_protocol
+                }],
+                'api_key': settings.typesense_api_key,
+                'connection_timeout_seconds': settings.typesense_schema_timeout,
+                'num_retries': 0
+            })
+        return self._schema_client
+    
+    def collection(self, name: Optional[str] = None) -> Any:
+        """Retorna o handle (em cache) de uma collection de produtos."""
+        name = name or settings.products_collection
+        if name not in self._collections:
+            self._collections[name] = self.client.collections[name]
+        return self._collections[name]
+    
+    def read_collection(self, name: Optional[str] = None) -> Any:
+        """Retorna o handle (em cache) de uma collection no cliente de leitura."""
+        name = name or settings.products_collection
+        if name not in self._read_collections:
+            self._read_collections[name] = self.read_client.collections[name]
+        return self._read_collections[name]
+    
+    async def ensure_collection(self, name: Optional[str] = None) -> bool:
+        """Prepara o schema da collection na primeira vez em que é usada."""
+        name = name or settings.products_collection
+        if name in self._ready_collections:
+            return True
+        return await self.create_products_collection(name)
+    
+    async def bootstrap_collections(self) -> bool:
+        """Prepara todas as collections configuradas (padrão e storefronts)."""
+        results = [await self.ensure_collection(name) for name in settings.all_collections()]
+        return all(results)
         
     async def health_check(self) -> Dict[str, Any]:
         """Verifica se o Typesense está acessível."""
         try:
             # Tentar fazer uma operação simples para verificar conectividade
-            collections = self.client.collections.retrieve()
+            collections = await call_typesense("health_check", self.read_client.collections.retrieve)
             return {"status": "ok", "typesense": {"collections": len(collections)}}
-        except Exception as e:
-            logger.error(f"Erro na conexão com Typesense: {e}")
-            return {"status": "error", "message": str(e)}
+        except SearchServiceError as e:
+            return {"status": "error", "code": e.code, "message": e.message}
     
-    async def create_products_collection(self) -> bool:
-        """Cria a collection de produtos se não existir."""
+    def products_schema(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """Retorna o schema desejado de uma collection de produtos."""
         schema = {
-            'name': settings.products_collection,
+            'name': name or settings.products_collection,
             'fields': [
                 {'name': 'id', 'type': 'string'},
                 {'name': 'nome', 'type': 'string'},
                 {'name': 'descricao', 'type': 'string'},
-                {'name': 'preco', 'type': 'float'},
+                {'name': 'preco', 'type': 'float', 'sort': True, 'range_index': True},
                 {'name': 'categoria', 'type': 'string', 'facet': True},
                 {'name': 'marca', 'type': 'string', 'facet': True},
-                {'name': 'avaliacao', 'type': 'float'},
-                {'name': 'estoque', 'type': 'int32'},
-                {'name': 'tags', 'type': 'string[]', 'facet': True}
+                {'name': 'avaliacao', 'type': 'float', 'sort': True},
+                {'name': 'estoque', 'type': 'int32', 'sort': True, 'range_index': True},
+                {'name': 'tags', 'type': 'string[]', 'facet': True},
+                # Campos derivados (calculados em index_document)
+                {'name': 'em_estoque', 'type': 'bool', 'facet': True, 'optional': True},
+                {'name': 'faixa_preco', 'type': 'string', 'facet': True, 'optional': True}
             ],
             'default_sorting_field': 'avaliacao'
         }
         
+        if settings.embeddings_enabled:
+            schema['fields'].append({
+                'name': 'embedding',
+                'type': 'float[]',
+                'num_dim': settings.embedding_dim,
+                'optional': True
+            })
+            # Modelo que gerou o vetor, para reprocessar quando o modelo mudar
+            schema['fields'].append({'name': 'embedding_model', 'type': 'string', 'optional': True})
+        
+        return schema
+    
+    async def _with_embeddings(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Preenche `embedding`/`embedding_model` dos documentos, calculados em lote (em thread)."""
+        if not settings.embeddings_enabled or not documents:
+            return documents
+        vectors = await asyncio.to_thread(lambda: get_embedding_service().embed_documents(documents))
+        model_id = embedding_model_id()
+        for document, vector in zip(documents, vectors):
+            document['embedding'] = vector
+            document['embedding_model'] = model_id
+        return documents
+    
+    async def create_products_collection(self, name: Optional[str] = None) -> bool:
+        """
+        Cria a collection de produtos se não existir.
+        
+        Se ela já existir, apenas avisa sobre alterações de schema pendentes;
+        a migração é feita por `data/migrate_schema.py`, fora do startup.
+        """
+        name = name or settings.products_collection
+        schema = self.products_schema(name)
+        
         try:
-            self.client.collections.create(schema)
-            logger.info(f"Collection '{settings.products_collection}' criada com sucesso")
-            return True
-        except TypesenseClientError as e:
-            if "already exists" in str(e):
-                logger.info(f"Collection '{settings.products_collection}' já existe")
+            await call_typesense(
+                "create_collection",
+                lambda: self.client.collections.create(schema),
+                expected=(ConflictError,)
+            )
+            logger.info(f"Collection '{name}' criada com sucesso")
+        except ConflictError:
+            logger.info(f"Collection '{name}' já existe")
+            try:
+                pending = await self.pending_schema_changes(name)
+            except SearchServiceError:
+                pending = []
+            if pending:
+                altered = sorted({c['name'] for c in pending})
+                logger.warning(
+                    f"Collection '{name}' com alterações de schema pendentes ({', '.join(altered)}): "
+                    f"execute data/migrate_schema.py"
+                )
+        except SearchServiceError:
+            return False
+        
+        self._ready_collections.add(name)
+        return True
+    
+    async def pending_schema_changes(self, name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Compara o schema da collection existente com o desejado.
+        
+        Campos ausentes são adicionados e campos cujas opções divergem
+        (tipo, facet, sort, range_index, optional) são removidos e
+        readicionados na mesma alteração, como exige o Typesense.
+        """
+        name = name or settings.products_collection
+        retrieved = await call_typesense(
+            "retrieve_collection", self.read_collection(name).retrieve, idempotent=True
+        )
+        current = {f['name']: f for f in retrieved.get('fields', [])}
+        
+        changes = []
+        for field in self.products_schema(name)['fields']:
+            if field['name'] == 'id':
+                continue
+            existing = current.get(field['name'])
+            if existing is None:
+                changes.append(field)
+            elif any(existing.get(k, False) != v for k, v in field.items()):
+                changes.append({'name': field['name'], 'drop': True})
+                changes.append(field)
+        return changes
+    
+    async def sync_products_schema(self, name: Optional[str] = None) -> bool:
+        """Aplica as alterações de schema pendentes na collection existente."""
+        name = name or settings.products_collection
+        try:
+            changes = await self.pending_schema_changes(name)
+            if not changes:
+                logger.info(f"Schema da collection '{name}' já está atualizado")
                 return True
-            else:
-                logger.error(f"Erro ao criar collection: {e}")
-                return False
-        except Exception as e:
-            logger.error(f"Erro inesperado ao criar collection: {e}")
+            
+            collection = self.schema_client.collections[name]
+            await call_typesense("update_collection", lambda: collection.update({'fields': changes}))
+            altered = sorted({c['name'] for c in changes})
+            logger.info(f"Schema da collection '{name}' alterado: {', '.join(altered)}")
+            return True
+        except SearchServiceError:
             return False
     
-    async def index_document(self, document: Dict[str, Any]) -> Dict[str, Any]:
-        """Indexa um documento na collection de produtos."""
+    def _export_stream(self, name: str, include_fields: str) -> requests.Response:
+        """
+        Abre o export JSONL da collection como stream (bloqueante).
+        
+        O cliente `typesense` retorna o export inteiro como uma string; o stream
+        permite ler os documentos aos poucos em catálogos grandes.
+        """
+        url = (
+            f"{settings.typesense_protocol}://{settings.typesense_host}:{settings.typesense_port}"
+            f"/collections/{quote(name, safe='')}/documents/export"
+        )
+        response = requests.get(
+            url,
+            params={'include_fields': include_fields},
+            headers={'X-TYPESENSE-API-KEY': settings.typesense_api_key},
+            stream=True,
+            timeout=(settings.typesense_timeout, settings.typesense_schema_timeout)
+        )
+        if not response.ok:
+            response.content  # lê o corpo do erro antes de fechar a conexão
+            response.close()
+            response.raise_for_status()
+        return response
+    
+    async def _send_backfill_batch(self, documents: Any, chunk: List[Any]) -> int:
+        """Envia um lote de updates parciais do backfill e retorna quantos tiveram sucesso."""
+        # Embeddings recalculados por lote para limitar a memória em catálogos grandes
+        stale_documents = await self._with_embeddings(
+            [dict(source) for _, _, source in chunk if source is not None]
+        )
+        embedded = iter(stale_documents)
+        batch = []
+        for document_id, update, source in chunk:
+            if source is not None:
+                document = next(embedded)
+                update = {
+                    **update,
+                    'embedding': document['embedding'],
+                    'embedding_model': document['embedding_model']
+                }
+            batch.append({'id': document_id, **update})
+        
+        results = await call_typesense(
+            "backfill_documents", lambda: documents.import_(batch, {'action': 'update'})
+        )
+        return sum(1 for result in results if result.get('success'))
+    
+    async def backfill_documents(self, name: Optional[str] = None, batch_size: int = 500) -> int:
+        """
+        Preenche os campos derivados dos documentos já indexados.
+        
+        Lê o export (apenas os campos necessários) em stream e envia updates
+        parciais, em lotes de `batch_size`, somente para os documentos cujos
+        valores derivados estão ausentes ou desatualizados. Com embeddings
+        habilitados, também recalcula os vetores gerados por outro modelo (ou
+        ausentes). A memória usada é limitada pelo lote, não pelo catálogo.
+        Retorna o número de documentos atualizados.
+        """
+        name = name or settings.products_collection
+        documents = self.schema_client.collections[name].documents
+        include_fields = 'id,preco,estoque,em_estoque,faixa_preco'
+        if settings.embeddings_enabled:
+            include_fields += ',nome,descricao,embedding_model'
+        model_id = embedding_model_id()
+        
+        response = await call_typesense(
+            "export_documents", lambda: self._export_stream(name, include_fields)
+        )
+        lines = response.iter_lines()
+        # (id, campos a atualizar, documento se o embedding precisa ser recalculado)
+        pending = []
+        pending_count = 0
+        updated = 0
         try:
-            result = self.client.collections[settings.products_collection].documents.create(document)
-            logger.info(f"Documento indexado: {document.get('id', 'sem_id')}")
-            return {"status": "success", "document": result}
-        except Exception as e:
-            logger.error(f"Erro ao indexar documento: {e}")
-            return {"status": "error", "message": str(e)}
+            while True:
+                chunk = await call_typesense(
+                    "export_documents", lambda: list(itertools.islice(lines, batch_size))
+                )
+                if not chunk:
+                    break
+                for line in chunk:
+                    if not line.strip():
+                        continue
+                    document = json.loads(line)
+                    derived = with_derived_fields(document)
+                    update = {
+                        key: derived[key]
+                        for key in ('em_estoque', 'faixa_preco')
+                        if key in derived and document.get(key) != derived[key]
+                    }
+                    stale = settings.embeddings_enabled and document.get('embedding_model') != model_id
+                    if update or stale:
+                        pending.append((document['id'], update, document if stale else None))
+                
+                # Enviar cada lote assim que completo, sem acumular o catálogo
+                while len(pending) >= batch_size:
+                    pending_count += batch_size
+                    updated += await self._send_backfill_batch(documents, pending[:batch_size])
+                    pending = pending[batch_size:]
+            
+            if pending:
+                pending_count += len(pending)
+                updated += await self._send_backfill_batch(documents, pending)
+        finally:
+            response.close()
+        
+        if updated < pending_count:
+            logger.warning(f"Collection '{name}': {pending_count - updated} documentos falharam no backfill")
+        logger.info(f"Collection '{name}': {updated} documentos atualizados no backfill")
+        return updated
+    
+    async def index_document(
+        self,
+        document: Dict[str, Any],
+        collection: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Indexa um documento na collection de produtos."""
+        await self.ensure_collection(collection)
+        document = (await self._with_embeddings([with_derived_fields(document)]))[0]
+        documents = self.collection(collection).documents
+        result = await call_typesense("index_document", lambda: documents.create(document))
+        result.pop('embedding', None)
+        result.pop('embedding_model', None)
+        logger.info(f"Documento indexado: {document.get('id', 'sem_id')}")
+        return {"status": "success", "document": result}
+    
+    async def upsert_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        collection: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Insere ou atualiza um lote de documentos em uma única chamada de import."""
+        await self.ensure_collection(collection)
+        documents = await self._with_embeddings([with_derived_fields(doc) for doc in documents])
+        handle = self.collection(collection).documents
+        results = await call_typesense(
+            "upsert_documents", lambda: handle.import_(documents, {'action': 'upsert'})
+        )
+        
+        succeeded = []
+        failed = []
+        for document, result in zip(documents, results):
+            if result.get('success'):
+                succeeded.append(document['id'])
+            else:
+                failed.append({"id": document.get('id'), "error": result.get('error')})
+        
+        logger.info(f"Lote importado: {len(succeeded)} sucessos, {len(failed)} falhas")
+        return {"status": "success", "succeeded": succeeded, "failed": failed}
+    
+    async def delete_documents(
+        self,
+        document_ids: List[str],
+        collection: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Remove documentos por ID, em lotes que cabem no limite da query string.
+        
+        `deleted_ids` lista apenas os IDs que não estão mais na collection: se o
+        Typesense remover menos documentos que o pedido, os IDs do lote que
+        ainda existem são consultados e ficam de fora. Para tratar falhas por
+        lote, passe lotes de `id_filter_batches` (um request de remoção cada).
+        """
+        handle = self.collection(collection).documents
+        read_handle = self.read_collection(collection).documents
+        deleted_ids: List[str] = []
+        num_deleted = 0
+        for batch in id_filter_batches(document_ids):
+            filter_by = id_filter(batch)
+            result = await call_typesense(
+                "delete_documents", lambda: handle.delete({'filter_by': filter_by})
+            )
+            batch_deleted = result.get('num_deleted', 0)
+            num_deleted += batch_deleted
+            if batch_deleted >= len(batch):
+                deleted_ids.extend(batch)
+                continue
+            
+            # IDs já ausentes também contam como removidos; os restantes não
+            remaining = await call_typesense(
+                "find_documents",
+                lambda: read_handle.search({
+                    'q': '*',
+                    'filter_by': filter_by,
+                    'include_fields': 'id',
+                    'per_page': len(batch)
+                }),
+                idempotent=True
+            )
+            present = {hit['document']['id'] for hit in remaining.get('hits', [])}
+            deleted_ids.extend(document_id for document_id in batch if document_id not in present)
+        
+        logger.info(f"Lote removido: {num_deleted} documentos")
+        return {"status": "success", "deleted_ids": deleted_ids, "num_deleted": num_deleted}
     
     async def search_products(
         self, 
@@ -87,99 +499,118 @@ class TypesenseClient:
         filters: Optional[str] = None,
         sort_by: Optional[str] = None,
         limit: int = 10,
-        offset: int = 0
+        offset: int = 0,
+        collection: Optional[str] = None,
+        hybrid: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Busca produtos na collection.
+        
+        Com `hybrid=True`, combina a busca textual com similaridade vetorial
+        sobre o campo `embedding` (peso definido em `hybrid_alpha`).
+        """
+        search_params = {
+            'q': query,
+            'query_by': 'nome,descricao,marca,tags',
+            'per_page': limit,
+            'page': (offset // limit) + 1,
+            'sort_by': sort_by or '_text_match:desc,avaliacao:desc',
+            'exclude_fields': 'embedding,embedding_model'
+        }
+        
+        if filters:
+            search_params['filter_by'] = filters
+        
+        if hybrid:
+            vector = await asyncio.to_thread(lambda: get_embedding_service().embed_query(query))
+            values = ",".join(f"{v:.6f}" for v in vector)
+            search_params['vector_query'] = (
+                f"embedding:([{values}], k:{max(limit + offset, 100)}, alpha:{settings.hybrid_alpha})"
+            )
+            # Vetores longos excedem o limite de query string: usar multi_search (POST)
+            search_params['collection'] = collection or settings.products_collection
+            response = await call_typesense(
+                "search_products",
+                lambda: self.read_client.multi_search.perform({'searches': [search_params]}, {}),
+                idempotent=True
+            )
+            results = response['results'][0]
+            if 'error' in results:
+                # multi_search retorna 200 com o erro (e o status) de cada busca no corpo
+                raise error_for_status(results.get('code'), results['error'])
+        else:
+            documents = self.read_collection(collection).documents
+            results = await call_typesense(
+                "search_products", lambda: documents.search(search_params), idempotent=True
+            )
+        
+        return {
+            "status": "success",
+            "results": results.get('hits', []),
+            "total": results.get('found', 0),
+            "query": query,
+            "filters": filters
+        }
+    
+    async def autocomplete(
+        self,
+        prefix: str,
+        limit: int = 5,
+        collection: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Busca produtos na collection."""
-        try:
-            search_params = {
-                'q': query,
-                'query_by': 'nome,descricao,marca,tags',
-                'per_page': limit,
-                'page': (offset // limit) + 1,
-                'sort_by': sort_by or '_text_match:desc,avaliacao:desc'
-            }
-            
-            if filters:
-                search_params['filter_by'] = filters
-                
-            results = self.client.collections[settings.products_collection].documents.search(search_params)
-            
-            return {
-                "status": "success",
-                "results": results.get('hits', []),
-                "total": results.get('found', 0),
-                "query": query,
-                "filters": filters
-            }
-        except Exception as e:
-            logger.error(f"Erro na busca: {e}")
-            return {
-                "status": "error", 
-                "message": str(e),
-                "results": [],
-                "total": 0,
-                "query": query,
-                "filters": filters
-            }
-    
-    async def autocomplete(self, prefix: str, limit: int = 5) -> Dict[str, Any]:
         """Busca por autocompletar baseado em prefixo."""
-        try:
-            search_params = {
-                'q': prefix,
-                'query_by': 'nome,marca',
-                'per_page': limit,
-                'prefix': True,
-                'sort_by': 'avaliacao:desc'
-            }
-            
-            results = self.client.collections[settings.products_collection].documents.search(search_params)
-            
-            # Extrair sugestões únicas
-            suggestions = []
-            seen = set()
+        search_params = {
+            'q': prefix,
+            'query_by': 'nome,marca',
+            'per_page': limit,
+            'prefix': True,
+            'sort_by': 'avaliacao:desc',
+            'exclude_fields': 'embedding,embedding_model'
+        }
+        
+        documents = self.read_collection(collection).documents
+        results = await call_typesense(
+            "autocomplete", lambda: documents.search(search_params), idempotent=True
+        )
+        
+        # Extrair sugestões únicas
+        suggestions = []
+        seen = set()
+        
+        for hit in results.get('hits', []):
+            doc = hit.get('document', {})
+            nome = doc.get('nome', '')
+            marca = doc.get('marca', '')
             
-            for hit in results.get('hits', []):
-                doc = hit.get('document', {})
-                nome = doc.get('nome', '')
-                marca = doc.get('marca', '')
+            # Adicionar nome se relevante
+            if nome.lower().startswith(prefix.lower()) and nome.lower() not in seen:
+                suggestions.append(nome)
+                seen.add(nome.lower())
                 
-                # Adicionar nome se relevante
-                if nome.lower().startswith(prefix.lower()) and nome.lower() not in seen:
-                    suggestions.append(nome)
-                    seen.add(nome.lower())
-                    
-                # Adicionar marca se relevante  
-                if marca.lower().startswith(prefix.lower()) and marca.lower() not in seen:
-                    suggestions.append(marca)
-                    seen.add(marca.lower())
-                    
-                if len(suggestions) >= limit:
-                    break
-            
-            return {
-                "status": "success",
-                "suggestions": suggestions[:limit],
-                "prefix": prefix
-            }
-        except Exception as e:
-            logger.error(f"Erro no autocompletar: {e}")
-            return {
-                "status": "error",
-                "message": str(e),
-                "suggestions": [],
-                "prefix": prefix
-            }
-    
-    async def delete_document(self, document_id: str) -> Dict[str, Any]:
+            # Adicionar marca se relevante  
+            if marca.lower().startswith(prefix.lower()) and marca.lower() not in seen:
+                suggestions.append(marca)
+                seen.add(marca.lower())
+                
+            if len(suggestions) >= limit:
+                break
+        
+        return {
+            "status": "success",
+            "suggestions": suggestions[:limit],
+            "prefix": prefix
+        }
+    
+    async def delete_document(
+        self,
+        document_id: str,
+        collection: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Remove um documento da collection."""
-        try:
-            self.client.collections[settings.products_collection].documents[document_id].delete()
-            logger.info(f"Documento removido: {document_id}")
-            return {"status": "success", "deleted_id": document_id}
-        except Exception as e:
-            logger.error(f"Erro ao remover documento: {e}")
-            return {"status": "error", "message": str(e)}
+        document = self.collection(collection).documents[document_id]
+        await call_typesense("delete_document", document.delete, expected=(NotFoundError,))
+        logger.info(f"Documento removido: {document_id}")
+        return {"status": "success", "deleted_id": document_id}
 
 
 # Instância global do cliente
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark de latência: busca textual (keyword) x busca híbrida (keyword + vetor).
+
+Executa as mesmas consultas nos dois modos contra o Typesense configurado e
+mostra p50/p95/média. Na busca híbrida, mede separadamente a primeira
+execução (embedding calculado) e as seguintes (embedding vindo do cache).
+
+Uso:
+    python data/benchmark_search.py
+    python data/benchmark_search.py --rounds 50 --storefront loja_sp
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.embeddings import get_embedding_service
+from app.errors import SearchServiceError
+from app.typesense_client import get_typesense_client
+
+
+QUERIES = [
+    "iphone",
+    "celular bom para fotos",
+    "notebook para jogos",
+    "fone com cancelamento de ruído",
+    "tablet para desenhar",
+    "smartphone android barato",
+]
+
+
+def summarize(label: str, samples: List[float]) -> None:
+    """Imprime as estatísticas de latência (em ms)."""
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[max(0, int(len(samples_ms) * 0.95) - 1)]
+    print(
+        f"   {label:<22} n={len(samples_ms):<4} "
+        f"p50={statistics.median(samples_ms):7.2f}ms  "
+        f"p95={p95:7.2f}ms  "
+        f"média={statistics.mean(samples_ms):7.2f}ms"
+    )
+
+
+async def timed(call: Callable[[], Awaitable[Dict]]) -> float:
+    """Executa a chamada e retorna o tempo gasto."""
+    start = time.perf_counter()
+    await call()
+    return time.perf_counter() - start
+
+
+async def run_benchmark(rounds: int, collection: str) -> bool:
+    """Executa o benchmark e imprime o resumo."""
+    client = get_typesense_client()
+
+    health = await client.health_check()
+    if health["status"] != "ok":
+        print(f"❌ Typesense não está disponível: {health.get('message', 'Erro desconhecido')}")
+        return False
+
+    service = get_embedding_service()
+    print(f"🚀 Benchmark em '{collection}' ({len(QUERIES)} consultas x {rounds} rodadas)")
+    print(f"   Embedder: {service.embedder.name} ({service.embedder.dim} dimensões)")
+
+    keyword: List[float] = []
+    hybrid_cold: List[float] = []
+    hybrid_warm: List[float] = []
+    embed_only: List[float] = []
+
+    try:
+        for query in QUERIES:
+            # Custo isolado do embedding (sem cache)
+            start = time.perf_counter()
+            service.embedder.embed(query)
+            embed_only.append(time.perf_counter() - start)
+
+            # Primeira busca híbrida calcula o embedding; as demais usam o cache
+            service.forget_query(query)
+            hybrid_cold.append(await timed(
+                lambda: client.search_products(query, collection=collection, hybrid=True)
+            ))
+
+        for _ in range(rounds):
+            for query in QUERIES:
+                keyword.append(await timed(
+                    lambda: client.search_products(query, collection=collection)
+                ))
+                hybrid_warm.append(await timed(
+                    lambda: client.search_products(query, collection=collection, hybrid=True)
+                ))
+    except SearchServiceError as e:
+        print(f"❌ Erro durante o benchmark: {e.code} - {e.message}")
+        return False
+
+    print("\n📊 Latência:")
+    summarize("embedding (CPU)", embed_only)
+    summarize("keyword", keyword)
+    summarize("híbrida (sem cache)", hybrid_cold)
+    summarize("híbrida (com cache)", hybrid_warm)
+    return True
+
+
+def parse_args() -> argparse.Namespace:
+    """Lê os argumentos de linha de comando."""
+    parser = argparse.ArgumentParser(description="Benchmark de busca keyword x híbrida")
+    parser.add_argument('--rounds', type=int, default=20, help="Rodadas de cada consulta")
+    parser.add_argument('--storefront', default=None, help="Storefront a consultar (collection padrão se omitido)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if not settings.embeddings_enabled:
+        print("❌ Embeddings desabilitados (EMBEDDINGS_ENABLED=false)")
+        sys.exit(1)
+
+    try:
+        collection = settings.collection_for(args.storefront)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    success = asyncio.run(run_benchmark(args.rounds, collection))
+    sys.exit(0 if success else 1)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Script de migração de schema das collections de produtos.
+
+Aplica as alterações de schema pendentes (campos novos ou com opções
+diferentes) e preenche os campos derivados dos documentos já indexados.
+Deve ser executado fora do startup da API, após atualizar a aplicação.
+
+Uso:
+    python data/migrate_schema.py                         # todas as collections
+    python data/migrate_schema.py --storefront loja_sp    # apenas um storefront
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from typing import List
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.errors import SearchServiceError
+from app.typesense_client import get_typesense_client
+
+
+async def migrate(collections: List[str], batch_size: int) -> bool:
+    """Migra o schema e faz o backfill de cada collection."""
+    client = get_typesense_client()
+
+    health = await client.health_check()
+    if health["status"] != "ok":
+        print(f"❌ Typesense não está disponível: {health.get('message', 'Erro desconhecido')}")
+        return False
+
+    success = True
+    for name in collections:
+        print(f"\n📐 Collection '{name}'")
+
+        if not await client.create_products_collection(name):
+            print("   ❌ Erro ao configurar collection")
+            success = False
+            continue
+
+        if not await client.sync_products_schema(name):
+            print("   ❌ Erro ao alterar schema")
+            success = False
+            continue
+        print("   ✅ Schema atualizado")
+
+        try:
+            updated = await client.backfill_documents(name, batch_size=batch_size)
+        except SearchServiceError as e:
+            print(f"   ❌ Erro no backfill: {e.code} - {e.message}")
+            success = False
+            continue
+        print(f"   ✅ Backfill concluído: {updated} documentos atualizados")
+
+    return success
+
+
+def parse_args() -> argparse.Namespace:
+    """Lê os argumentos de linha de comando."""
+    parser = argparse.ArgumentParser(description="Migração de schema das collections de produtos")
+    parser.add_argument('--storefront', default=None, help="Migrar apenas a collection deste storefront")
+    parser.add_argument('--batch-size', type=int, default=500, help="Documentos por lote de backfill")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if args.storefront:
+        try:
+            collections = [settings.collection_for(args.storefront)]
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    else:
+        collections = settings.all_collections()
+
+    success = asyncio.run(migrate(collections, args.batch_size))
+    sys.exit(0 if success else 1)
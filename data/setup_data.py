@@ -13,6 +13,7 @@ import os
 # Adicionar o diretório raiz ao path para imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from app.errors import SearchServiceError
 from app.typesense_client import get_typesense_client
 
 
@@ -61,18 +62,21 @@ async def load_sample_data():
     
     print(f"\n📦 Indexando {len(produtos)} produtos...")
     
+    # Upsert em lote: pode ser executado novamente sem falhar em IDs existentes
+    try:
+        result = await client.upsert_documents(produtos)
+    except SearchServiceError as e:
+        print(f"❌ Erro ao indexar produtos: {e.code} - {e.message}")
+        return False
+    
+    errors = {failure['id']: failure['error'] for failure in result["failed"]}
     for i, produto in enumerate(produtos, 1):
-        try:
-            result = await client.index_document(produto)
-            if result["status"] == "success":
-                success_count += 1
-                print(f"✅ {i:2d}/{len(produtos)} - {produto['nome']}")
-            else:
-                error_count += 1
-                print(f"❌ {i:2d}/{len(produtos)} - Erro ao indexar {produto['nome']}: {result.get('message', 'Erro desconhecido')}")
-        except Exception as e:
+        if produto['id'] in errors:
             error_count += 1
-            print(f"❌ {i:2d}/{len(produtos)} - Exceção ao indexar {produto['nome']}: {e}")
+            print(f"❌ {i:2d}/{len(produtos)} - Erro ao indexar {produto['nome']}: {errors[produto['id']]}")
+        else:
+            success_count += 1
+            print(f"✅ {i:2d}/{len(produtos)} - {produto['nome']}")
     
     print(f"\n📊 Resultado da indexação:")
     print(f"   ✅ Sucessos: {success_count}")
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Script de sincronização incremental do catálogo com o Typesense.
+
+Calcula um hash do conteúdo de cada produto, compara com o estado da última
+sincronização (salvo em um arquivo JSON local) e envia ao Typesense apenas os
+upserts e remoções necessários, em lotes.
+
+Uso:
+    python data/sync_data.py                                  # arquivo padrão
+    python data/sync_data.py --source data/catalogo/          # diretório JSON/NDJSON
+    python data/sync_data.py --source data/catalogo/ --watch  # modo contínuo
+    python data/sync_data.py --storefront loja_sp             # collection do storefront
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.embeddings import embedding_model_id
+from app.errors import SearchServiceError
+from app.typesense_client import get_typesense_client, id_filter_batches
+
+
+DEFAULT_SOURCE = 'data/produtos_eletronicos.json'
+DEFAULT_STATE = 'data/.sync_state.json'
+SOURCE_EXTENSIONS = ('.json', '.ndjson', '.jsonl')
+
+
+def list_source_files(source: str, exclude: Optional[str] = None) -> List[str]:
+    """
+    Lista os arquivos de origem (um arquivo ou todos os JSON/NDJSON de um diretório).
+
+    Ignora arquivos ocultos (como o estado e o cache locais), temporários
+    `.tmp` e o caminho em `exclude`.
+    """
+    if not os.path.isdir(source):
+        return [source]
+    excluded = os.path.abspath(exclude) if exclude else None
+    return sorted(
+        path
+        for path in (os.path.join(source, name) for name in os.listdir(source))
+        if not os.path.basename(path).startswith('.')
+        and path.endswith(SOURCE_EXTENSIONS)
+        and os.path.abspath(path) != excluded
+    )
+
+
+def load_products(source: str, exclude: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Carrega os produtos da origem, indexados por ID."""
+    produtos = {}
+    for path in list_source_files(source, exclude):
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith('.json'):
+                data = json.load(f)
+                items = data if isinstance(data, list) else [data]
+            else:
+                items = [json.loads(line) for line in f if line.strip()]
+        for produto in items:
+            produtos[produto['id']] = produto
+    return produtos
+
+
+def fingerprint(produto: Dict[str, Any], salt: str = '') -> str:
+    """
+    Calcula o hash do conteúdo de um produto.
+
+    O `salt` identifica o modelo de embeddings: se ele mudar, todos os produtos
+    são reenviados e seus vetores recalculados.
+    """
+    payload = json.dumps(produto, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(f"{salt}|{payload}".encode('utf-8')).hexdigest()
+
+
+def load_state(path: str) -> Dict[str, str]:
+    """Carrega o estado da última sincronização ({id: hash})."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_state(path: str, state: Dict[str, str]) -> None:
+    """Salva o estado de forma atômica para não corromper em caso de interrupção."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def diff_products(
+    produtos: Dict[str, Dict[str, Any]],
+    state: Dict[str, str]
+) -> Tuple[List[Dict[str, Any]], List[str], Dict[str, str]]:
+    """Compara a origem com o estado e retorna (upserts, remoções, novos hashes)."""
+    salt = embedding_model_id() if settings.embeddings_enabled else ''
+    hashes = {product_id: fingerprint(produto, salt) for product_id, produto in produtos.items()}
+    upserts = [produtos[product_id] for product_id, h in hashes.items() if state.get(product_id) != h]
+    deletes = [product_id for product_id in state if product_id not in produtos]
+    return upserts, deletes, hashes
+
+
+def batched(items: List[Any], size: int) -> List[List[Any]]:
+    """Divide uma lista em lotes de tamanho fixo."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+async def sync_once(source: str, state_path: str, batch_size: int, collection: str) -> bool:
+    """Executa uma rodada de sincronização incremental."""
+    try:
+        produtos = load_products(source, exclude=state_path)
+    except FileNotFoundError:
+        print(f"❌ Origem não encontrada: {source}")
+        return False
+    except (json.JSONDecodeError, KeyError) as e:
+        print(f"❌ Erro ao ler produtos da origem: {e}")
+        return False
+
+    state = load_state(state_path)
+    upserts, deletes, hashes = diff_products(produtos, state)
+
+    print(f"📦 {len(produtos)} produtos na origem ({collection}): {len(upserts)} para atualizar, {len(deletes)} para remover")
+    if not upserts and not deletes:
+        print("✅ Nada a sincronizar")
+        return True
+
+    client = get_typesense_client()
+    if not await client.ensure_collection(collection):
+        print("❌ Erro ao configurar collection de produtos")
+        return False
+
+    error_count = 0
+
+    for batch in batched(upserts, batch_size):
+        try:
+            result = await client.upsert_documents(batch, collection=collection)
+        except SearchServiceError as e:
+            error_count += len(batch)
+            print(f"❌ Erro ao importar lote: {e.code} - {e.message}")
+            continue
+        for product_id in result["succeeded"]:
+            state[product_id] = hashes[product_id]
+        for failure in result["failed"]:
+            error_count += 1
+            print(f"❌ Erro ao importar {failure['id']}: {failure['error']}")
+        # Persistir progresso a cada lote para retomar de onde parou
+        save_state(state_path, state)
+
+    # Remoções vão na query string (filter_by): lotes limitados pelo tamanho do filtro
+    for batch in id_filter_batches(deletes, batch_size):
+        try:
+            result = await client.delete_documents(batch, collection=collection)
+        except SearchServiceError as e:
+            error_count += len(batch)
+            print(f"❌ Erro ao remover lote: {e.code} - {e.message}")
+            continue
+        for product_id in result["deleted_ids"]:
+            state.pop(product_id, None)
+        not_deleted = len(batch) - len(result["deleted_ids"])
+        if not_deleted:
+            error_count += not_deleted
+            print(f"❌ {not_deleted} produtos não foram removidos")
+        save_state(state_path, state)
+
+    print(f"📊 Sincronização concluída: {len(upserts) + len(deletes) - error_count} alterações aplicadas, {error_count} erros")
+    return error_count == 0
+
+
+def source_signature(source: str, exclude: Optional[str] = None) -> Tuple[Tuple[str, float, int], ...]:
+    """Assinatura barata da origem (nome, mtime, tamanho) para detectar mudanças."""
+    signature = []
+    for path in list_source_files(source, exclude):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature.append((path, stat.st_mtime, stat.st_size))
+    return tuple(signature)
+
+
+async def watch(source: str, state_path: str, batch_size: int, interval: float, collection: str) -> None:
+    """Sincroniza continuamente sempre que os arquivos de origem mudarem."""
+    print(f"👀 Observando {source} a cada {interval:g}s (Ctrl+C para sair)")
+    last_signature = None
+    while True:
+        signature = source_signature(source, exclude=state_path)
+        if signature != last_signature:
+            # Rodadas com falha são repetidas no próximo ciclo
+            if await sync_once(source, state_path, batch_size, collection):
+                last_signature = signature
+        await asyncio.sleep(interval)
+
+
+def parse_args() -> argparse.Namespace:
+    """Lê os argumentos de linha de comando."""
+    parser = argparse.ArgumentParser(description="Sincronização incremental do catálogo com o Typesense")
+    parser.add_argument('--source', default=DEFAULT_SOURCE, help="Arquivo ou diretório JSON/NDJSON de produtos")
+    parser.add_argument('--state', default=None, help=f"Arquivo de estado da última sincronização (padrão: {DEFAULT_STATE})")
+    parser.add_argument('--storefront', default=None, help="Storefront de destino (usa a collection configurada em STOREFRONT_COLLECTIONS)")
+    parser.add_argument('--batch-size', type=int, default=500, help="Documentos por lote de import/remoção")
+    parser.add_argument('--watch', action='store_true', help="Observar a origem e sincronizar a cada mudança")
+    parser.add_argument('--interval', type=float, default=5.0, help="Intervalo de verificação no modo watch (segundos)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    try:
+        collection = settings.collection_for(args.storefront)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    # Cada storefront mantém seu próprio estado de sincronização
+    state_path = args.state or (
+        f"data/.sync_state.{args.storefront}.json" if args.storefront else DEFAULT_STATE
+    )
+
+    if args.watch:
+        try:
+            asyncio.run(watch(args.source, state_path, args.batch_size, args.interval, collection))
+        except KeyboardInterrupt:
+            print("\n🛑 Sincronização interrompida")
+        sys.exit(0)
+
+    success = asyncio.run(sync_once(args.source, state_path, args.batch_size, collection))
+    sys.exit(0 if success else 1)